@@ -75,7 +75,7 @@ class BadNet(Attack):
             poison_input = self.add_mark(_input)
             poison_dataset = TensorListDataset(poison_input, _label)
             dataset = torch.utils.data.ConcatDataset([clean_dataset, poison_dataset])
-            loader = self.dataset.get_dataloader('train', dataset=dataset)
+            loader = self.dataset.get_dataloader('train', dataset=dataset, distributed=True)
             self.model._train(epoch, save=save,
                               validate_func=self.validate_func, loader_train=loader,
                               save_fn=self.save, **kwargs)
@@ -104,7 +104,7 @@ class BadNet(Attack):
 
     def save(self, **kwargs):
         filename = self.get_filename(**kwargs)
-        file_path = self.folder_path + filename
+        file_path = os.path.join(self.folder_path, filename)
         self.mark.save_npz(file_path + '.npz')
         self.mark.save_img(file_path + '.png')
         self.model.save(file_path + '.pth')
@@ -112,7 +112,7 @@ class BadNet(Attack):
 
     def load(self, **kwargs):
         filename = self.get_filename(**kwargs)
-        file_path = self.folder_path + filename
+        file_path = os.path.join(self.folder_path, filename)
         self.mark.load_npz(file_path + '.npz')
         self.model.load(file_path + '.pth')
         print('attack results loaded from: ', file_path)
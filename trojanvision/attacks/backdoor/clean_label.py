@@ -132,8 +132,8 @@ class CleanLabel(BadNet):
                                                                              batch_size=self.poison_num, num_workers=0)
                 source_imgs, _ = self.model.get_data(next(iter(sample_source_class_dataloader)))
 
-                g_path = f'{self.folder_path}gan_dim{self.noise_dim}_class{source_class}_g.pth'
-                d_path = f'{self.folder_path}gan_dim{self.noise_dim}_class{source_class}_d.pth'
+                g_path = os.path.join(self.folder_path, f'gan_dim{self.noise_dim}_class{source_class}_g.pth')
+                d_path = os.path.join(self.folder_path, f'gan_dim{self.noise_dim}_class{source_class}_d.pth')
                 if os.path.exists(g_path) and os.path.exists(d_path) and not self.train_gan:
                     self.wgan.G.load_state_dict(torch.load(g_path, map_location=env['device']))
                     self.wgan.D.load_state_dict(torch.load(d_path, map_location=env['device']))
@@ -174,7 +174,7 @@ class CleanLabel(BadNet):
             # poison_set = torch.utils.data.ConcatDataset([poison_set, target_original_dataset])
         final_set = torch.utils.data.ConcatDataset([poison_set, full_set])
         # final_set = poison_set
-        final_loader = self.dataset.get_dataloader(mode='train', dataset=final_set, num_workers=0)
+        final_loader = self.dataset.get_dataloader(mode='train', dataset=final_set, num_workers=0, distributed=True)
         self.model._train(optimizer=optimizer, lr_scheduler=lr_scheduler, save_fn=self.save,
                           loader_train=final_loader, validate_func=self.validate_func, **kwargs)
 
@@ -9,6 +9,7 @@ import numpy as np
 from itertools import combinations
 from scipy.special import comb
 import argparse
+import os
 
 
 class TrojanNet(BadNet):
@@ -88,12 +89,12 @@ class TrojanNet(BadNet):
 
     def save(self, **kwargs):
         filename = self.get_filename(**kwargs)
-        file_path = self.folder_path + filename
+        file_path = os.path.join(self.folder_path, filename)
         self.mlp_model.save(file_path + '.pth', verbose=True)
 
     def load(self, **kwargs):
         filename = self.get_filename(**kwargs)
-        file_path = self.folder_path + filename
+        file_path = os.path.join(self.folder_path, filename)
         self.mlp_model.load(file_path + '.pth', verbose=True)
 
     def validate_func(self, get_data_fn=None, loss_fn=None, **kwargs) -> tuple[float, float, float]:
@@ -8,6 +8,7 @@ import numpy as np
 import math
 import random
 import argparse
+import os
 
 
 class PoisonBasic(Attack):
@@ -94,7 +95,7 @@ class PoisonBasic(Attack):
 
     def save(self, **kwargs):
         filename = self.get_filename(**kwargs)
-        file_path = self.folder_path + filename
+        file_path = os.path.join(self.folder_path, filename)
         self.model.save(file_path + '.pth')
         print('attack results saved at: ', file_path)
 
@@ -104,7 +105,7 @@ class PoisonBasic(Attack):
     def validate_target(self, indent: int = 0, verbose=True) -> tuple[float, float]:
         self.model.eval()
         _output = self.model(self.temp_input)
-        target_acc, _ = self.model.accuracy(_output, self.temp_label, topk=(1, 5))
+        target_acc = float(self.model.accuracy(_output, self.temp_label, topk=(1, 5))[0])
         target_conf = float(self.model.get_target_prob(self.temp_input, self.temp_label).mean())
         target_loss = self.model.loss(self.temp_input, self.temp_label)
         if verbose:
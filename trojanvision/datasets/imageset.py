@@ -6,6 +6,7 @@ from trojanzoo.utils import to_tensor
 
 import torch
 import torch.utils.data
+import torch.utils.data.distributed
 import torchvision.transforms as transforms
 from torchvision.datasets import VisionDataset
 import numpy as np
@@ -32,19 +33,32 @@ class ImageSet(Dataset):
         return transforms.ToTensor()
 
     def get_dataloader(self, mode: str, dataset: Dataset = None, batch_size: int = None, shuffle: bool = None,
-                       num_workers: int = None, pin_memory=True, drop_last=False, **kwargs) -> torch.utils.data.DataLoader:
+                       num_workers: int = None, pin_memory: bool = None, drop_last=False,
+                       distributed: bool = False, persistent_workers: bool = False,
+                       **kwargs) -> torch.utils.data.DataLoader:
         if batch_size is None:
             batch_size = self.test_batch_size if mode == 'test' else self.batch_size
         if shuffle is None:
             shuffle = True if mode == 'train' else False
         if num_workers is None:
             num_workers = self.num_workers if mode == 'train' else 0
+        if pin_memory is None:
+            pin_memory = self.pin_memory    # pinned batches make the non_blocking copies in get_data asynchronous
         if dataset is None:
             dataset = self.get_dataset(mode, **kwargs)
         if env['num_gpus'] == 0:
             pin_memory = False
-        return torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=shuffle,
-                                           num_workers=num_workers, pin_memory=pin_memory, drop_last=drop_last)
+        sampler = None
+        if distributed and env['ddp']:     # only epoch loaders iterated by Model._train are sharded across ranks
+            sampler = torch.utils.data.distributed.DistributedSampler(dataset, shuffle=shuffle)
+            shuffle = False
+        worker_kwargs = {}
+        if num_workers > 0:
+            # persistent_workers keeps workers alive across epochs; only worth it for loaders iterated repeatedly
+            worker_kwargs = {'persistent_workers': persistent_workers, 'prefetch_factor': self.prefetch_factor}
+        return torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, sampler=sampler,
+                                           num_workers=num_workers, pin_memory=pin_memory, drop_last=drop_last,
+                                           **worker_kwargs)
 
     @staticmethod
     def get_data(data: tuple[torch.Tensor, torch.Tensor], **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
@@ -67,10 +81,10 @@ class ImageSet(Dataset):
                 image: Image.Image
                 target_class: int
                 class_name = idx_to_class[target_class]
-                _dir = self.folder_path + self.name + f'/{mode}/{class_name}/'
+                _dir = os.path.join(self.folder_path, self.name, mode, class_name)
                 if not os.path.exists(_dir):
                     os.makedirs(_dir)
-                image.save(_dir + f'{class_counters[target_class]}{img_type}')
+                image.save(os.path.join(_dir, f'{class_counters[target_class]}{img_type}'))
                 class_counters[target_class] += 1
 
     def to_memory(dataset: VisionDataset, label_only: bool = False) -> tuple[np.ndarray, list[int]]:
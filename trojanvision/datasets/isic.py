@@ -55,17 +55,17 @@ class ISIC(ImageFolder):
 
         print('Splitting dataset to class folders ...')
 
-        src_folder = self.folder_path + self.name + '/train/'
+        src_folder = os.path.join(self.folder_path, self.name, 'train')
         if env['tqdm']:
             labels = tqdm(labels[1:])
         for label in labels:
             seq = new_dict[label]
-            dst_folder = f'{src_folder}{label}/'
+            dst_folder = os.path.join(src_folder, label)
             if not os.path.exists(dst_folder):
                 os.makedirs(dst_folder)
             for img in seq:
-                src = src_folder + img + '.jpg'
-                dest = dst_folder + img + '.jpg'
+                src = os.path.join(src_folder, img + '.jpg')
+                dest = os.path.join(dst_folder, img + '.jpg')
                 shutil.move(src, dest)
 
 
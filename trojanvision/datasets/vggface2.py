@@ -41,7 +41,7 @@ class VGGface2(ImageFolder):
                 folder_path = self.folder_path
             if file_name is None:
                 file_name = f'{self.name}_{mode}.{file_ext}'
-                file_path = folder_path + file_name
+                file_path = os.path.join(folder_path, file_name)
         if os.path.exists(file_path['train']):
             print('File Already Exists: ', file_path)
             return file_path
@@ -150,8 +150,8 @@ class ABS(BackdoorDefense):
                 print(_str)
                 if not os.path.exists(self.folder_path):
                     os.makedirs(self.folder_path)
-                np.save(self.folder_path + self.get_filename(target_class=self.target_class) + '.npy', neuron_dict)
-                np.save(self.folder_path + self.get_filename(target_class=self.target_class) + '_best.npy', result_dict)
+                np.save(os.path.join(self.folder_path, self.get_filename(target_class=self.target_class) + '.npy'), neuron_dict)
+                np.save(os.path.join(self.folder_path, self.get_filename(target_class=self.target_class) + '_best.npy'), result_dict)
             print(
                 f'Label: {label:3d}  loss: {result_dict[label]["loss"]:10.3f}  ATK loss: {result_dict[label]["attack_loss"]:10.3f}  Norm: {result_dict[label]["norm"]:10.3f}  Jaccard: {result_dict[label]["jaccard"]:10.3f}  Score: {best_score:.3f}')
             score_list[label] = best_score
@@ -375,7 +375,7 @@ class ABS(BackdoorDefense):
     def load(self, path: str = None):
 
         if path is None:
-            path = self.folder_path + self.get_filename(target_class=self.target_class) + '_best.npy'
+            path = os.path.join(self.folder_path, self.get_filename(target_class=self.target_class) + '_best.npy')
         _dict = np.load(path, allow_pickle=True).item()
         self.attack.mark.mark = to_tensor(_dict[self.target_class]['mark'])
         self.attack.mark.alpha_mask = to_tensor(_dict[self.target_class]['mask'])
@@ -8,6 +8,7 @@ import torch
 import torch.nn as nn
 import torch.nn.utils.prune as prune
 import argparse
+import os
 
 
 class FinePruning(BackdoorDefense):
@@ -75,7 +76,7 @@ class FinePruning(BackdoorDefense):
             _, target_acc, clean_acc = self.attack.validate_func()
             if self.attack.clean_acc - clean_acc > 20:
                 break
-        file_path = self.folder_path + self.get_filename() + '.pth'
+        file_path = os.path.join(self.folder_path, self.get_filename() + '.pth')
         self.model._train(validate_func=self.attack.validate_func, file_path=file_path, **kwargs)
         self.attack.validate_func()
 
@@ -92,7 +92,7 @@ class SpectralSignature(BackdoorDefense):
 
         self.mix_dataset = torch.utils.data.ConcatDataset([self.clean_dataset, self.poison_dataset])
         self.mix_dataloader = self.dataset.get_dataloader(
-            mode='train', dataset=self.mix_dataset, num_workers=0, pin_memory=False)
+            mode='train', dataset=self.mix_dataset, num_workers=0, pin_memory=False, distributed=True)
 
     def detect(self, optimizer, lr_scheduler, **kwargs):
         """
@@ -156,5 +156,6 @@ class SpectralSignature(BackdoorDefense):
             else:
                 final_set = torch.utils.data.ConcatDataset([final_set, self.class_dataset])
 
-        final_dataloader = self.dataset.get_dataloader(mode=None, dataset=final_set, num_workers=0, pin_memory=False)
+        final_dataloader = self.dataset.get_dataloader(mode=None, dataset=final_set, num_workers=0, pin_memory=False,
+                                                       distributed=True)
         return final_dataloader
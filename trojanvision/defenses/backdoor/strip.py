@@ -6,6 +6,7 @@ from trojanzoo.utils import to_numpy
 
 import torch
 import numpy as np
+import os
 from sklearn import metrics
 from tqdm import tqdm
 
@@ -34,7 +35,7 @@ class STRIP(BackdoorDefense):
         clean_entropy = torch.cat(clean_entropy).flatten().sort()[0]
         poison_entropy = torch.cat(poison_entropy).flatten().sort()[0]
         _dict = {'clean': to_numpy(clean_entropy), 'poison': to_numpy(poison_entropy)}
-        result_file = f'{self.folder_path}{self.get_filename()}.npy'
+        result_file = os.path.join(self.folder_path, f'{self.get_filename()}.npy')
         np.save(result_file, _dict)
         print('File Saved at : ', result_file)
         print('Entropy Clean  Median: ', float(clean_entropy.median()))
@@ -53,16 +54,18 @@ class STRIP(BackdoorDefense):
         print("accuracy_score:", metrics.accuracy_score(y_true, y_pred))
 
     def check(self, _input: torch.Tensor, _label: torch.Tensor) -> torch.Tensor:
-        _list = []
+        _sum: torch.Tensor = None   # running sum instead of stacking all N entropies
+        count = 0
         for i, data in enumerate(self.loader):
             if i >= self.N:
                 break
             X, Y = self.model.get_data(data)
             _test = self.superimpose(_input, X)
-            entropy = self.entropy(_test).cpu()
-            _list.append(entropy)
+            entropy = self.entropy(_test)
+            _sum = entropy if _sum is None else _sum.add_(entropy)
+            count += 1
             # _class = self.model.get_class(_test)
-        return torch.stack(_list).mean(0)
+        return _sum.div_(count).cpu()
 
     def superimpose(self, _input1: torch.Tensor, _input2: torch.Tensor, alpha: float = None):
         if alpha is None:
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from trojanzoo.environ import env
 from trojanzoo.utils import to_tensor
 from trojanzoo.utils.output import ansi, prints, Indent_Redirect
 
@@ -43,7 +44,11 @@ class Dataset:
         group.add_argument('--test_batch_size', dest='test_batch_size', type=int,
                            help='test batch size.')
         group.add_argument('--num_workers', dest='num_workers', type=int,
-                           help='num_workers passed to torch.utils.data.DataLoader for training set, defaults to 4. (0 for validation set)')
+                           help='num_workers passed to torch.utils.data.DataLoader for training set, defaults to min(8, cpu_count). (0 for validation set)')
+        group.add_argument('--prefetch_factor', dest='prefetch_factor', type=int,
+                           help='batches loaded in advance by each worker of torch.utils.data.DataLoader, defaults to 2.')
+        group.add_argument('--no_pin_memory', dest='pin_memory', action='store_false', default=None,
+                           help='disable pin_memory of torch.utils.data.DataLoader, defaults to pin when gpu is available.')
         group.add_argument('--download', dest='download', action='store_true',
                            help='download dataset if not exist by calling dataset.initialize()')
         group.add_argument('--data_dir', dest='data_dir',
@@ -52,17 +57,21 @@ class Dataset:
 
     def __init__(self, batch_size: int = None, folder_path: str = None, download: bool = False,
                  split_ratio: float = 0.8, train_sample: int = 1024, test_ratio: float = 0.3,
-                 num_workers: int = 4, loss_weights: Union[bool, np.ndarray] = False, test_batch_size: int = 1, **kwargs):
+                 num_workers: int = None, prefetch_factor: int = 2, pin_memory: bool = True,
+                 loss_weights: Union[bool, np.ndarray] = False, test_batch_size: int = 1, **kwargs):
         self.param_list: dict[str, list[str]] = {}
         self.param_list['dataset'] = ['data_type', 'folder_path', 'label_names',
-                                      'batch_size', 'num_classes', 'num_workers', 'test_batch_size']
+                                      'batch_size', 'num_classes', 'num_workers', 'prefetch_factor',
+                                      'pin_memory', 'test_batch_size']
         self.__batch_size: int = 0
         self.batch_size = batch_size
         self.test_batch_size = test_batch_size
         self.split_ratio = split_ratio
         self.train_sample = train_sample
         self.test_ratio = test_ratio
-        self.num_workers = num_workers
+        self.num_workers = num_workers if num_workers is not None else min(8, os.cpu_count() or 1)
+        self.prefetch_factor = prefetch_factor
+        self.pin_memory = pin_memory
         # ----------------------------------------------------------------------------- #
 
         self.folder_path = folder_path
@@ -76,11 +85,11 @@ class Dataset:
                 self.initialize()
         # Preset Loader
         self.loader: dict[str, torch.utils.data.DataLoader] = {}
-        self.loader['train'] = self.get_dataloader(mode='train')
+        self.loader['train'] = self.get_dataloader(mode='train', distributed=True, persistent_workers=True)
         self.loader['train2'] = self.get_dataloader(mode='train', full=False)
-        self.loader['valid'] = self.get_dataloader(mode='valid')
+        self.loader['valid'] = self.get_dataloader(mode='valid', persistent_workers=True)
         self.loader['valid2'] = self.get_dataloader(mode='valid', full=False)
-        self.loader['test'] = self.get_dataloader(mode='test')
+        self.loader['test'] = self.get_dataloader(mode='test', persistent_workers=True)
         # ----------------------------------------------------------------------------- #
         # Loss Weights
         self.loss_weights: np.ndarray = loss_weights
@@ -161,7 +170,9 @@ class Dataset:
         return torch.utils.data.Subset(dataset, idx)
 
     def get_dataloader(self, mode: str, batch_size: int = None, shuffle: bool = None,
-                       num_workers: int = None, pin_memory: bool = True, **kwargs) -> torch.utils.data.dataloader:
+                       num_workers: int = None, pin_memory: bool = None,
+                       distributed: bool = False, persistent_workers: bool = False,
+                       **kwargs) -> torch.utils.data.dataloader:
         pass
 
     @staticmethod
@@ -221,4 +232,5 @@ class Dataset:
 
     @batch_size.setter
     def batch_size(self, value: int):
-        self.__batch_size = value if value >= 0 else -value * max(1, torch.cuda.device_count())
+        # under DDP every process loads its own per-gpu batch
+        self.__batch_size = value if value >= 0 else -value * (1 if env['ddp'] else max(1, torch.cuda.device_count()))
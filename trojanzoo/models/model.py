@@ -2,7 +2,7 @@
 
 from trojanzoo.datasets.dataset import Dataset
 from trojanzoo.environ import env
-from trojanzoo.utils import add_noise, empty_cache, repeat_to_batch, to_tensor
+from trojanzoo.utils import empty_cache, repeat_to_batch, to_tensor
 from trojanzoo.utils.output import ansi, prints, output_iter
 from trojanzoo.utils import AverageMeter
 
@@ -11,20 +11,25 @@ import torch
 import torch.nn as nn
 import torch.optim
 import torch.utils.data
+import torch.utils.data.distributed
 import torch.cuda.amp
 from torch.optim.optimizer import Optimizer
 from torch.optim.lr_scheduler import _LRScheduler
 import numpy as np
 import argparse
+import inspect
 import os
 import datetime
 import time
 from tqdm import tqdm
 from collections import OrderedDict
+from functools import partial
 from collections.abc import Callable, Iterable    # TODO: callable (many places) (wait for python update)
 from typing import Generator, Iterator, Mapping, Set, Union, Optional
 
 InputType = Union[torch.Tensor, tuple]
+# torch>=2.1: memory-map checkpoints and restrict unpickling to tensors
+_LOAD_MMAP: bool = 'mmap' in inspect.signature(torch.load).parameters
 # redirect = Indent_Redirect(buffer=True, indent=0)
 
 
@@ -77,25 +82,24 @@ class _Model(nn.Module):
         num_classes = num_classes if num_classes is not None else self.num_classes
         if fc_depth <= 0:
             return nn.Sequential(OrderedDict([('fc', nn.Identity())]))
-        dim_list: list[int] = [fc_dim] * (fc_depth - 1)
-        dim_list.insert(0, conv_dim)
-        ActivationType: type[nn.Module] = nn.ReLU
-        if activation == 'sigmoid':
-            ActivationType = nn.Sigmoid
-        elif not activation == 'relu':
-            raise NotImplementedError(f'{activation=}')
-        seq = []
         if fc_depth == 1:
-            seq.append(('fc', nn.Linear(self.conv_dim, num_classes)))
-        else:
-            for i in range(fc_depth - 1):
-                seq.append(('fc' + str(i + 1), nn.Linear(dim_list[i], dim_list[i + 1])))
-                if activation:
-                    seq.append((f'{activation}{i + 1:d}', ActivationType(inplace=True)))
-                if dropout:
-                    seq.append((f'dropout{i + 1:d}', nn.Dropout()))
-            seq.append(('fc' + str(self.fc_depth),
-                        nn.Linear(self.fc_dim, self.num_classes)))
+            return nn.Sequential(OrderedDict([('fc', nn.Linear(conv_dim, num_classes))]))
+        activation_fn: Callable[[], nn.Module] = None
+        if activation == 'relu':
+            activation_fn = partial(nn.ReLU, inplace=True)
+        elif activation == 'sigmoid':
+            activation_fn = nn.Sigmoid  # no inplace variant
+        elif activation:
+            raise NotImplementedError(f'{activation=}')
+        dim_list: list[int] = [conv_dim] + [fc_dim] * (fc_depth - 1)
+        seq: list[tuple[str, nn.Module]] = []
+        for i in range(fc_depth - 1):
+            seq.append((f'fc{i + 1:d}', nn.Linear(dim_list[i], dim_list[i + 1])))
+            if activation:
+                seq.append((f'{activation}{i + 1:d}', activation_fn()))
+            if dropout:
+                seq.append((f'dropout{i + 1:d}', nn.Dropout()))
+        seq.append((f'fc{fc_depth:d}', nn.Linear(fc_dim, num_classes)))
         return nn.Sequential(OrderedDict(seq))
 
 
@@ -121,17 +125,29 @@ class Model:
                            help='randomized smoothing sampling std, defaults to 0.01')
         group.add_argument('--rs_n', dest='rs_n', type=int,
                            help='randomized smoothing sampling number, defaults to 100')
+        group.add_argument('--rs_chunk', dest='rs_chunk', type=int,
+                           help='randomized smoothing noisy copies of the batch per forward pass, '
+                           'defaults to as many as fit in one training batch (at least 1)')
+        group.add_argument('--compile', dest='compile', action='store_true',
+                           help='wrap the model with torch.compile, defaults to False')
+        group.add_argument('--channels_last', dest='channels_last', action='store_true',
+                           help='use torch.channels_last memory format for model and inputs, defaults to False')
+        group.add_argument('--find_unused_parameters', dest='find_unused_parameters', action='store_true',
+                           help='let DistributedDataParallel tolerate parameters without gradients, '
+                           'defaults to False (enabled automatically when training a parameter subset)')
         return group
 
     def __init__(self, name: str = None, model_class: type[_Model] = _Model, dataset: Dataset = None,
                  num_classes: int = None, folder_path: str = None,
                  official: bool = False, pretrain: bool = False,
-                 randomized_smooth: bool = False, rs_sigma: float = 0.01, rs_n: int = 100,
-                 suffix: str = '', **kwargs):
+                 randomized_smooth: bool = False, rs_sigma: float = 0.01, rs_n: int = 100, rs_chunk: int = None,
+                 suffix: str = '', compile: bool = False, channels_last: bool = False,
+                 find_unused_parameters: bool = False, **kwargs):
         self.param_list: dict[str, list[str]] = {}
-        self.param_list['model'] = ['suffix', 'pretrain', 'official', 'randomized_smooth']
+        self.param_list['model'] = ['suffix', 'pretrain', 'official', 'randomized_smooth',
+                                    'compile', 'channels_last', 'find_unused_parameters']
         if randomized_smooth:
-            self.param_list['model'].extend(['rs_sigma', 'rs_n'])
+            self.param_list['model'].extend(['rs_sigma', 'rs_n', 'rs_chunk'])
         self.name: str = name
         self.dataset = dataset
         self.suffix = suffix
@@ -140,12 +156,22 @@ class Model:
         self.randomized_smooth: bool = randomized_smooth
         self.rs_sigma: float = rs_sigma
         self.rs_n: int = rs_n
+        self.rs_chunk: int = rs_chunk
+        self.compile: bool = compile
+        self.channels_last: bool = channels_last
+        self.find_unused_parameters: bool = find_unused_parameters
+        # DistributedDataParallel wrappers used by _train, keyed by find_unused_parameters
+        self._ddp_models: dict[bool, nn.Module] = {}
+        # bfloat16 (Ampere+) has the float32 exponent range, so it needs no GradScaler.
+        # Check the capability directly: is_bf16_supported() also reports emulated (slow) bf16 on older GPUs.
+        self.amp_dtype: torch.dtype = torch.float16
+        if env['num_gpus'] and torch.cuda.get_device_capability() >= (8, 0):
+            self.amp_dtype = torch.bfloat16
 
         self.folder_path = folder_path
         if folder_path is not None:
             self.folder_path = os.path.normpath(folder_path)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
+            os.makedirs(self.folder_path, exist_ok=True)
 
         # ------------Auto-------------- #
         loss_weights: np.ndarray = None if 'loss_weights' not in kwargs.keys() else kwargs['loss_weights']
@@ -155,38 +181,53 @@ class Model:
             num_classes = num_classes if num_classes is not None else dataset.num_classes
             loss_weights = loss_weights if 'loss_weights' in kwargs.keys() else dataset.loss_weights
         self.num_classes = num_classes  # number of classes
-        self.loss_weights = loss_weights  # TODO: what device shall we save loss_weights? numpy, torch, or torch.cuda.
+        # cast once to a float32 tensor on env['device'] so the criterion never has to convert per batch
+        self.loss_weights: torch.Tensor = to_tensor(loss_weights, dtype='float')
 
         # ------------------------------ #
-        self.criterion = self.define_criterion(weight=to_tensor(loss_weights))
+        self.criterion = self.define_criterion(weight=self.loss_weights)
         self.softmax = nn.Softmax(dim=1)
         self._model = model_class(num_classes=num_classes, **kwargs)
+        self._active_param_ids: frozenset[int] = None
         self.activate_params([])
         if official:
             self.load('official')
         if pretrain:
             self.load()
+        if env['num_gpus']:  # TODO: might be useless if we set map_location correctly
+            self._model.cuda()
+        if channels_last:
+            self._model.to(memory_format=torch.channels_last)
         self.model = self.get_parallel_model()
         self.eval()
-        if env['num_gpus']:  # TODO: might be useless if we set map_location correctly
-            self.cuda()
+        if compile:
+            # self._model stays eager for load/save and layer-wise access.
+            self.model = torch.compile(self.model, mode='reduce-overhead')
 
     # ----------------- Forward Operations ----------------------#
 
     def get_logits(self, _input: InputType, randomized_smooth: bool = None,
-                   rs_sigma: float = None, rs_n: int = None, **kwargs) -> torch.Tensor:
+                   rs_sigma: float = None, rs_n: int = None, rs_chunk: int = None, **kwargs) -> torch.Tensor:
         randomized_smooth = randomized_smooth if randomized_smooth is not None else self.randomized_smooth
         if randomized_smooth:
             rs_sigma = rs_sigma if rs_sigma is not None else self.rs_sigma
             rs_n = rs_n if rs_n is not None else self.rs_n
-            _list = []
-            for _ in range(rs_n):
-                _input_noise = add_noise(_input, std=rs_sigma)
-                _list.append(self.model(_input_noise, **kwargs))
-            return torch.stack(_list).mean(dim=0)
-            # TODO: memory issues and parallel possibilities
-            # _input_noise = add_noise(repeat_to_batch(_input, batch_size=n), std=sigma).flatten(end_dim=1)
-            # return self.model(_input_noise, **kwargs).view(n, len(_input), self.num_classes).mean(dim=0)
+            rs_chunk = rs_chunk if rs_chunk is not None else self.rs_chunk
+            if rs_chunk is None:
+                # cap each pass at about one training batch of samples (at least one noisy copy)
+                batch_size = self.dataset.batch_size if self.dataset is not None else len(_input)
+                rs_chunk = max(1, batch_size // len(_input))
+            rs_chunk = min(rs_chunk, rs_n)
+            # forward rs_chunk noisy copies of the batch at once: (n * batch_size, ...)
+            _sum: torch.Tensor = None
+            for i in range(0, rs_n, rs_chunk):
+                n = min(rs_chunk, rs_n - i)
+                # sample the noise directly into the batch buffer and broadcast-add the input in place
+                _input_noise = torch.empty(n, *_input.shape, dtype=_input.dtype, device=_input.device)
+                _input_noise = _input_noise.normal_(std=rs_sigma).add_(_input).clamp(0, 1).flatten(end_dim=1)
+                _output = self.model(_input_noise, **kwargs).view(n, len(_input), -1).sum(dim=0)
+                _sum = _output if _sum is None else _sum.add_(_output)
+            return _sum.div_(rs_n)
         else:
             return self.model(_input, **kwargs)
 
@@ -203,11 +244,18 @@ class Model:
         return self.get_prob(_input, **kwargs).gather(dim=1, index=target.unsqueeze(1)).flatten()
 
     def get_class(self, _input: InputType, **kwargs) -> torch.Tensor:
-        return self.get_logits(_input, **kwargs).argmax(dim=-1)
+        with torch.inference_mode():
+            _output = self.get_logits(_input, **kwargs)
+        # argmax outside inference mode so callers get a regular tensor
+        return _output.argmax(dim=-1)
 
-    def loss(self, _input: InputType, _label: torch.Tensor, **kwargs) -> torch.Tensor:
+    def loss(self, _input: InputType, _label: torch.Tensor, return_output: bool = False,
+             **kwargs) -> Union[torch.Tensor, tuple[torch.Tensor, torch.Tensor]]:
         _output = self(_input, **kwargs)
-        return self.criterion(_output, _label)
+        loss = self.criterion(_output, _label)
+        if return_output:
+            return loss, _output
+        return loss
 
     # -------------------------------------------------------- #
 
@@ -232,6 +280,29 @@ class Model:
             OptimType: type[Optimizer] = getattr(torch.optim, OptimType)
         if len(kwargs) == 0 and OptimType == torch.optim.SGD:
             kwargs = {'momentum': 0.9, 'weight_decay': 2e-4, 'nesterov': True}
+        # multi-tensor update kernels: fused on CUDA when this optimizer/torch version has it, else foreach.
+        # Fused kernels validate device/dtype lazily at the first step(), so decide up front.
+        # materialise params (possibly generators) for the check below; param groups are
+        # shallow-copied so the caller's dicts are left untouched
+        param_list: list[Union[nn.Parameter, dict]] = []
+        flat_params: list[torch.Tensor] = []
+        for param in parameters:
+            if isinstance(param, dict):
+                group_params = param['params']
+                group_params = [group_params] if isinstance(group_params, torch.Tensor) else list(group_params)
+                param_list.append({**param, 'params': group_params})
+                flat_params.extend(group_params)
+            else:
+                param_list.append(param)
+                flat_params.append(param)
+        parameters = param_list
+        optim_params = inspect.signature(OptimType).parameters
+        if 'fused' not in kwargs and 'foreach' not in kwargs:
+            if 'fused' in optim_params and env['num_gpus'] and \
+                    all(param.is_cuda and param.is_floating_point() for param in flat_params):
+                kwargs['fused'] = True
+            elif 'foreach' in optim_params:
+                kwargs['foreach'] = True
         optimizer = OptimType(parameters, lr, **kwargs)
         _lr_scheduler: _LRScheduler = None
         if lr_scheduler:
@@ -250,6 +321,12 @@ class Model:
 
     # -----------------------------Load & Save Model------------------------------------------- #
 
+    # Resolve the default checkpoint path ``{folder_path}/{name}{suffix}.pth``.
+    def get_file_path(self, folder_path: str = None, suffix: str = None) -> str:
+        folder_path = folder_path if folder_path is not None else self.folder_path
+        suffix = suffix if suffix is not None else self.suffix
+        return os.path.normpath(os.path.join(folder_path, f'{self.name}{suffix}.pth'))
+
     # file_path: (default: '') if '', use the default path. Else if the path doesn't exist, quit.
     # full: (default: False) whether save feature extractor.
     # output: (default: False) whether output help information.
@@ -259,9 +336,7 @@ class Model:
              verbose: bool = False, indent: int = 0, **kwargs):
         map_location = map_location if map_location != 'default' else env['device']
         if file_path is None:
-            folder_path = folder_path if folder_path is not None else self.folder_path
-            suffix = suffix if suffix is not None else self.suffix
-            file_path = os.path.normpath(os.path.join(folder_path, f'{self.name}{suffix}.pth'))
+            file_path = self.get_file_path(folder_path=folder_path, suffix=suffix)
         if file_path == 'official':   # TODO
             _dict = self.get_official_weights(map_location=map_location)
             last_bias_value = next(reversed(_dict.values()))   # TODO: make sure
@@ -270,6 +345,9 @@ class Model:
                 _dict.popitem()
                 _dict.popitem()
         else:
+            if _LOAD_MMAP:
+                kwargs.setdefault('mmap', True)
+                kwargs.setdefault('weights_only', True)
             try:
                 # TODO: type annotation might change? dict[str, torch.Tensor]
                 _dict: OrderedDict[str, torch.Tensor] = torch.load(file_path, map_location=map_location, **kwargs)
@@ -294,13 +372,8 @@ class Model:
     def save(self, file_path: str = None, folder_path: str = None, suffix: str = None,
              component: str = '', verbose: bool = False, indent: int = 0, **kwargs):
         if file_path is None:
-            folder_path = folder_path if folder_path is not None else self.folder_path
-            suffix = suffix if suffix is not None else self.suffix
-            file_path = os.path.normpath(os.path.join(folder_path, f'{self.name}{suffix}.pth'))
-        else:
-            folder_path = os.path.dirname(file_path)
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
+            file_path = self.get_file_path(folder_path=folder_path, suffix=suffix)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         # TODO: type annotation might change? dict[str, torch.Tensor]
         module = self._model
         if component == 'features':
@@ -322,7 +395,7 @@ class Model:
 
     # -----------------------------------Train and Validate------------------------------------ #
     def _train(self, epoch: int, optimizer: Optimizer, lr_scheduler: _LRScheduler = None,
-               validate_interval: int = 10, save: bool = False, amp: bool = False, verbose: bool = True, indent: int = 0,
+               validate_interval: int = 10, save: bool = False, amp: bool = None, verbose: bool = True, indent: int = 0,
                loader_train: torch.utils.data.DataLoader = None, loader_valid: torch.utils.data.DataLoader = None,
                get_data_fn: Callable[..., tuple[InputType, torch.Tensor]] = None,
                loss_fn: Callable[..., torch.Tensor] = None,
@@ -330,55 +403,82 @@ class Model:
                save_fn: Callable = None, file_path: str = None, folder_path: str = None, suffix: str = None, **kwargs):
         loader_train = loader_train if loader_train is not None else self.dataset.loader['train']
         get_data_fn = get_data_fn if get_data_fn is not None else self.get_data
+        # the default loss can hand back its logits, saving a second forward pass for accuracy
+        reuse_output = loss_fn is None
         loss_fn = loss_fn if loss_fn is not None else self.loss
         validate_func = validate_func if validate_func is not None else self._validate
         save_fn = save_fn if save_fn is not None else self.save
 
+        amp = (amp if amp is not None else True) and bool(env['num_gpus'])
         scaler: torch.cuda.amp.GradScaler = None
-        if amp and env['num_gpus']:
+        if amp and self.amp_dtype == torch.float16:
             scaler = torch.cuda.amp.GradScaler()
         _, best_acc, _ = validate_func(loader=loader_valid, get_data_fn=get_data_fn, loss_fn=loss_fn,
-                                       verbose=verbose, indent=indent, **kwargs)
+                                       amp=amp, verbose=verbose, indent=indent, **kwargs)
         losses = AverageMeter('Loss')
         top1 = AverageMeter('Acc@1')
         top5 = AverageMeter('Acc@5')
         params: list[list[nn.Parameter]] = [param_group['params'] for param_group in optimizer.param_groups]
+        # Only the training step runs through DistributedDataParallel; validation, epoch_func and
+        # attacks/defenses keep the plain model so ranks never wait on each other's forwards.
+        eval_model = train_model = self.model
+        if env['ddp']:
+            # the extra graph traversal per backward is only needed when some parameters get no gradient
+            trained_ids = {id(param) for param_group in params for param in param_group}
+            find_unused = self.find_unused_parameters or \
+                any(id(param) not in trained_ids for param in self._model.parameters())
+            train_model = self.get_ddp_model(find_unused_parameters=find_unused)
+        # bind per-step callables once; the meters are reset in place so their bound methods stay valid
+        get_logits, accuracy = self.get_logits, self.accuracy
+        optimizer_step, optimizer_zero_grad = optimizer.step, optimizer.zero_grad
+        losses_update, top1_update, top5_update = losses.update, top1.update, top5.update
         for _epoch in range(epoch):
             if epoch_func is not None:
                 self.activate_params([])
                 epoch_func()
-                self.activate_params(params)
             losses.reset()
             top1.reset()
             top5.reset()
             epoch_start = time.perf_counter()
+            if isinstance(getattr(loader_train, 'sampler', None), torch.utils.data.distributed.DistributedSampler):
+                loader_train.sampler.set_epoch(_epoch)
             loader = loader_train
             if verbose and env['tqdm']:
                 loader = tqdm(loader_train)
+            self.model = train_model
             self.train()
             self.activate_params(params)
-            optimizer.zero_grad()
+            optimizer.zero_grad(set_to_none=True)
             for data in loader:
                 # data_time.update(time.perf_counter() - end)
                 _input, _label = get_data_fn(data, mode='train')
-                if amp and env['num_gpus']:
-                    loss = loss_fn(_input, _label, amp=True)
+                if self.channels_last and isinstance(_input, torch.Tensor) and _input.dim() == 4:
+                    _input = _input.contiguous(memory_format=torch.channels_last)
+                _output: torch.Tensor = None
+                with torch.autocast(device_type='cuda', dtype=self.amp_dtype, enabled=amp):
+                    if reuse_output:
+                        loss, _output = loss_fn(_input, _label, return_output=True)
+                    else:
+                        loss = loss_fn(_input, _label)
+                if scaler is not None:
                     scaler.scale(loss).backward()
                     scaler.step(optimizer)
                     scaler.update()
                 else:
-                    loss = loss_fn(_input, _label)
                     loss.backward()
-                    optimizer.step()
-                optimizer.zero_grad()
-                with torch.no_grad():
-                    _output = self.get_logits(_input)
-                acc1, acc5 = self.accuracy(_output, _label, topk=(1, 5))
+                    optimizer_step()
+                optimizer_zero_grad(set_to_none=True)
+                if _output is None:
+                    with torch.inference_mode():
+                        _output = get_logits(_input)
+                acc1, acc5 = accuracy(_output, _label, topk=(1, 5))
                 batch_size = int(_label.size(0))
-                losses.update(loss.item(), batch_size)
-                top1.update(acc1, batch_size)
-                top5.update(acc5, batch_size)
-                empty_cache()
+                losses_update(loss, batch_size)
+                top1_update(acc1, batch_size)
+                top5_update(acc5, batch_size)
+            self.model = eval_model
+            # only returns cached blocks to the driver; doing it per batch would defeat the caching allocator
+            empty_cache()
             epoch_time = str(datetime.timedelta(seconds=int(
                 time.perf_counter() - epoch_start)))
             self.eval()
@@ -400,12 +500,12 @@ class Model:
             if validate_interval != 0:
                 if (_epoch + 1) % validate_interval == 0 or _epoch == epoch - 1:
                     _, cur_acc, _ = validate_func(loader=loader_valid, get_data_fn=get_data_fn, loss_fn=loss_fn,
-                                                  verbose=verbose, indent=indent, **kwargs)
+                                                  amp=amp, verbose=verbose, indent=indent, **kwargs)
                     if cur_acc >= best_acc:
                         prints('best result update!', indent=indent)
                         prints(f'Current Acc: {cur_acc:.3f}    Previous Best Acc: {best_acc:.3f}', indent=indent)
                         best_acc = cur_acc
-                        if save:
+                        if save and not env['rank']:    # only the main process saves under DDP
                             save_fn(file_path=file_path, folder_path=folder_path, suffix=suffix, verbose=verbose)
                     if verbose:
                         print('-' * 50)
@@ -413,8 +513,10 @@ class Model:
 
     def _validate(self, full=True, print_prefix='Validate', indent=0, verbose=True,
                   loader: torch.utils.data.DataLoader = None,
-                  get_data_fn: Callable = None, loss_fn: Callable[..., float] = None, **kwargs) -> tuple[float, ...]:
+                  get_data_fn: Callable = None, loss_fn: Callable[..., float] = None,
+                  amp: bool = None, **kwargs) -> tuple[float, ...]:
         self.eval()
+        amp = (amp if amp is not None else True) and bool(env['num_gpus'])
         if loader is None:
             loader = self.dataset.loader['valid'] if full else self.dataset.loader['valid2']
         get_data_fn = get_data_fn if get_data_fn is not None else self.get_data
@@ -422,32 +524,37 @@ class Model:
         losses = AverageMeter('Loss', ':.4e')
         top1 = AverageMeter('Acc@1', ':6.2f')
         top5 = AverageMeter('Acc@5', ':6.2f')
+        get_logits, accuracy = self.get_logits, self.accuracy
+        losses_update, top1_update, top5_update = losses.update, top1.update, top5.update
         epoch_start = time.perf_counter()
         if verbose and env['tqdm']:
             loader = tqdm(loader)
         for data in loader:
             _input, _label = get_data_fn(data, mode='valid', **kwargs)
-            with torch.no_grad():
+            if self.channels_last and isinstance(_input, torch.Tensor) and _input.dim() == 4:
+                _input = _input.contiguous(memory_format=torch.channels_last)
+            with torch.inference_mode(), torch.autocast(device_type='cuda', dtype=self.amp_dtype, enabled=amp):
                 loss = loss_fn(_input, _label)
-                _output = self.get_logits(_input)
+                _output = get_logits(_input)
             # measure accuracy and record loss
             batch_size = int(_label.size(0))
-            losses.update(loss.item(), _label.size(0))
-            acc1, acc5 = self.accuracy(_output, _label, topk=(1, 5))
-            top1.update(acc1, batch_size)
-            top5.update(acc5, batch_size)
+            losses_update(loss, batch_size)
+            acc1, acc5 = accuracy(_output, _label, topk=(1, 5))
+            top1_update(acc1, batch_size)
+            top5_update(acc5, batch_size)
+        loss_avg, acc1_avg, acc5_avg = float(losses.avg), float(top1.avg), float(top5.avg)
         epoch_time = str(datetime.timedelta(seconds=int(
             time.perf_counter() - epoch_start)))
         if verbose:
             pre_str = '{yellow}{0}:{reset}'.format(print_prefix, **ansi).ljust(35)
             _str = ' '.join([
-                f'Loss: {losses.avg:.4f},'.ljust(20),
-                f'Top1 Acc: {top1.avg:.3f}, '.ljust(20),
-                f'Top5 Acc: {top5.avg:.3f},'.ljust(20),
+                f'Loss: {loss_avg:.4f},'.ljust(20),
+                f'Top1 Acc: {acc1_avg:.3f}, '.ljust(20),
+                f'Top5 Acc: {acc5_avg:.3f},'.ljust(20),
                 f'Time: {epoch_time},'.ljust(20),
             ])
             prints(pre_str, _str, prefix='{upline}{clear_line}'.format(**ansi) if env['tqdm'] else '', indent=indent)
-        return losses.avg, top1.avg, top5.avg
+        return loss_avg, acc1_avg, acc5_avg
 
     # -------------------------------------------Utility--------------------------------------- #
 
@@ -458,21 +565,25 @@ class Model:
             return data
 
     def accuracy(self, _output: torch.Tensor, _label: torch.Tensor,
-                 topk: tuple[int] = (1, 5)) -> tuple[float, ...]:
-        """Computes the precision@k for the specified values of k"""
-        with torch.no_grad():
-            maxk = min(max(topk), self.num_classes)
+                 topk: tuple[int] = (1, 5)) -> list[Union[float, torch.Tensor]]:
+        """Computes the precision@k for the specified values of k
+
+        Results stay on the device as 0-dim tensors to avoid a host sync per batch.
+        """
+        with torch.inference_mode():
             batch_size = _label.shape[0]
-            _, pred = _output.topk(maxk, 1, True, True)
-            pred = pred.t()
-            correct = pred.eq(_label.view(1, -1).expand_as(pred))
-            res: tuple[float, ...] = []
+            # rank of the true class = number of other logits >= it; top-k hit iff rank < k.
+            # Ties count against the label so a constant/overflowed output can't score 100%.
+            # No sort needed (topk(sorted=False) would break the prefix slicing for k < maxk).
+            rank = (_output >= _output.gather(1, _label.unsqueeze(1))).sum(dim=1) - 1
+            # NaN compares False everywhere, so force those rows to be misses
+            rank.masked_fill_(_output.isnan().any(dim=1), _output.shape[1])
+            res: list[Union[float, torch.Tensor]] = []
             for k in topk:
                 if k > self.num_classes:
                     res.append(100.0)
                 else:
-                    correct_k = correct[:k].flatten().float().sum(0, keepdim=True)
-                    res.append(float(correct_k.mul_(100.0 / batch_size)))
+                    res.append(rank.lt(k).sum(dtype=torch.float) * (100.0 / batch_size))
             return res
 
     def get_parameter_from_name(self, name: str = '') -> Iterator[nn.Parameter]:
@@ -486,18 +597,36 @@ class Model:
         return params
 
     def activate_params(self, param_groups: list[list[nn.Parameter]]):
+        params = [param for param_group in param_groups for param in param_group]
+        active_ids = frozenset(id(param) for param in params)
+        if active_ids == self._active_param_ids:    # skip the sweep if nothing changes
+            return
         for param in self._model.parameters():
-            param.requires_grad_(False)
-        for param_group in param_groups:
-            for param in param_group:
-                param.requires_grad_()
+            param.requires_grad_(id(param) in active_ids)
+        for param in params:    # param_groups might contain parameters of other modules
+            param.requires_grad_()
+        self._active_param_ids = active_ids
 
     # Need to overload for other packages (GNN) since they are calling their own nn.DataParallel.
     def get_parallel_model(self) -> Union[_Model, nn.DataParallel]:
+        if env['ddp']:
+            return self._model  # each process drives one device; _train wraps it with get_ddp_model
         if env['num_gpus'] > 1:
             return nn.DataParallel(self._model)
         return self._model
 
+    def get_ddp_model(self, find_unused_parameters: bool = False) -> nn.Module:
+        if find_unused_parameters not in self._ddp_models:
+            # DDP only registers gradient hooks for parameters requiring grad at construction.
+            self.activate_params([self._model.parameters()])
+            model = nn.parallel.DistributedDataParallel(self._model, device_ids=[env['device'].index],
+                                                        find_unused_parameters=find_unused_parameters)
+            self.activate_params([])
+            if self.compile:
+                model = torch.compile(model, mode='reduce-overhead')
+            self._ddp_models[find_unused_parameters] = model
+        return self._ddp_models[find_unused_parameters]
+
     @staticmethod
     def output_layer_information(layer: nn.Module, depth: int = 0, verbose: bool = True,
                                  indent: int = 0, tree_length: int = None):
@@ -529,7 +658,7 @@ class Model:
 
     def __call__(self, _input: InputType, amp: bool = False, **kwargs) -> torch.Tensor:
         if amp:
-            with torch.cuda.amp.autocast():
+            with torch.autocast(device_type='cuda', dtype=self.amp_dtype):
                 return self.get_logits(_input, **kwargs)
         return self.get_logits(_input, **kwargs)
 
@@ -597,14 +726,13 @@ class Model:
     # ----------------------------------------------------------------------------------------- #
 
     def remove_misclassify(self, data: tuple[InputType, torch.Tensor], **kwargs):
-        with torch.no_grad():
-            _input, _label = self.get_data(data, **kwargs)
-            _classification = self.get_class(_input)
-            repeat_idx = _classification.eq(_label)
+        # get_data stays outside inference mode: the returned inputs may be fed to autograd later
+        _input, _label = self.get_data(data, **kwargs)
+        repeat_idx = self.get_class(_input).eq(_label)
         return _input[repeat_idx], _label[repeat_idx]
 
     def generate_target(self, _input: InputType, idx: int = 1, same: bool = False) -> torch.Tensor:
-        with torch.no_grad():
+        with torch.inference_mode():
             _output = self.get_logits(_input)
         target = _output.argsort(dim=-1, descending=True)[:, idx]
         if same:
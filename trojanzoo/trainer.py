@@ -30,8 +30,10 @@ class Trainer:
                            help='use torch.optim.lr_scheduler.StepLR.')
         group.add_argument('--lr_decay_step', dest='lr_decay_step', type=int,
                            help='lr_decay_step passed to torch.optim.lr_scheduler.StepLR, defaults to 50.')
-        group.add_argument('--amp', dest='amp', action='store_true',
-                           help='Automatic Mixed Precision.')
+        group.add_argument('--amp', dest='amp', action='store_true', default=None,
+                           help='Automatic Mixed Precision, defaults to True when gpu is available.')
+        group.add_argument('--no_amp', dest='amp', action='store_false', default=None,
+                           help='disable Automatic Mixed Precision.')
         group.add_argument('--validate_interval', dest='validate_interval', type=int,
                            help='validate interval during training epochs, defaults to 10.')
         group.add_argument('--save', dest='save', action='store_true',
@@ -8,7 +8,9 @@ from trojanzoo.configs import Config, config
 import torch
 import torch.cuda
 import torch.backends.cudnn
+import torch.distributed
 import numpy as np
+import os
 import random
 import argparse
 
@@ -23,12 +25,14 @@ class Env(Param):
         group.add_argument('--seed', dest='seed', type=int,
                            help='the random seed for numpy, torch and cuda, defaults to config[env][seed]=1228')
         group.add_argument('--cache_threshold', dest='cache_threshold', type=float,
-                           help='the threshold (MB) to call torch.cuda.empty_cache(), defaults to config[env][cache_threshold]=None (never).')
+                           help='the threshold (MB) to call torch.cuda.empty_cache() after each training epoch, defaults to config[env][cache_threshold]=None (never).')
 
         group.add_argument('--device', dest='device',
                            help='set to \'cpu\' to force cpu-only and \'gpu\', \'cuda\' for gpu-only, defaults to None.')
         group.add_argument('--benchmark', dest='benchmark', action='store_true',
                            help='use torch.backends.cudnn.benchmark to accelerate without deterministic, defaults to False.')
+        group.add_argument('--ddp', dest='ddp', action='store_true',
+                           help='use DistributedDataParallel with one process per gpu (launch with torchrun), defaults to False.')
         group.add_argument('--verbose', dest='verbose', type=int,
                            help='show arguments and module information, defaults to False.')
         group.add_argument('--color', dest='color', action='store_true',
@@ -48,7 +52,7 @@ def add_argument(parser: argparse.ArgumentParser):
 
 
 def create(config_path: str = None, dataset_name: str = None, dataset: str = None,
-           seed: int = None, benchmark: bool = None,
+           seed: int = None, benchmark: bool = None, ddp: bool = None,
            config: Config = config,
            cache_threshold: float = None, verbose: int = None,
            color: bool = None, tqdm: bool = None, **kwargs) -> Env:
@@ -67,6 +71,17 @@ def create(config_path: str = None, dataset_name: str = None, dataset: str = Non
 
     num_gpus: int = torch.cuda.device_count()
     device = result['device']
+    if ddp is None and 'ddp' in env.keys():
+        ddp = env['ddp']
+    rank: int = 0
+    if ddp:
+        # torchrun provides MASTER_ADDR, RANK, WORLD_SIZE and LOCAL_RANK
+        if not torch.distributed.is_initialized():
+            torch.distributed.init_process_group(backend='nccl')
+        rank = torch.distributed.get_rank()
+        local_rank = int(os.environ['LOCAL_RANK'])
+        torch.cuda.set_device(local_rank)
+        device = torch.device('cuda', local_rank)
     if device == 'none':
         device = None
     else:
@@ -82,5 +97,5 @@ def create(config_path: str = None, dataset_name: str = None, dataset: str = Non
         benchmark = env['benchmark']
     if benchmark:
         torch.backends.cudnn.benchmark = benchmark
-    env.update(seed=seed, device=device, benchmark=benchmark, num_gpus=num_gpus)
+    env.update(seed=seed, device=device, benchmark=benchmark, num_gpus=num_gpus, ddp=ddp, rank=rank)
     return env
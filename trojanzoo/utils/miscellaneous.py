@@ -108,19 +108,23 @@ class AverageMeter(object):
 
     def reset(self):
         self.val = 0.
-        self.avg = 0.
         self.sum = 0.
         self.count = 0
 
-    def update(self, val: float, n: int = 1):
+    def update(self, val: Union[float, torch.Tensor], n: int = 1):
+        if isinstance(val, torch.Tensor):
+            val = val.detach()  # accumulate on device, only synchronize when the value is read
         self.val = val
-        self.sum += val * n
+        self.sum = self.sum + val * n
         self.count += n
-        self.avg = self.sum / self.count
+
+    @property
+    def avg(self) -> Union[float, torch.Tensor]:
+        return self.sum / self.count if self.count else 0.
 
     def __str__(self):
         fmtstr = '{name} {val' + self.fmt + '} ({avg' + self.fmt + '})'
-        return fmtstr.format(**self.__dict__)
+        return fmtstr.format(name=self.name, val=self.val, avg=self.avg)
 
 
 # class CrossEntropy(nn.Module):